@@ -30,6 +30,26 @@ GEMINI_MODELS = [
     "gemini-2.5-flash-lite",
 ]
 
+# Lighter models first for classifier-style calls that return one label
+GEMINI_MODELS_FAST = [
+    "gemini-2.5-flash-lite",
+    "gemini-2.5-flash",
+]
+
+# Per-request HTTP timeout for a single Gemini call (milliseconds)
+GEMINI_TIMEOUT_MS = int(os.getenv("GEMINI_TIMEOUT_MS", "30000"))
+
+# Max concurrent Gemini requests per process (Gemini 429s at low concurrency)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+
+# If the current model hasn't answered after this long, start the next one
+# in parallel and take whichever finishes first (hedged request)
+GEMINI_HEDGE_DELAY = int(os.getenv("GEMINI_HEDGE_MS", "8000")) / 1000
+
+# In-process Gemini response cache (see gemini_helpers._gemini_call)
+GEMINI_CACHE_MAXSIZE = 4096
+GEMINI_CACHE_TTL = 3600  # seconds
+
 # Wikipedia REST API (no key needed)
 WIKI_SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/"
 WIKI_SEARCH_URL = "https://en.wikipedia.org/w/api.php"
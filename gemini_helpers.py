@@ -1,67 +1,327 @@
 """
 Shared Gemini helpers — uses the new google.genai Client API.
 Consolidates the duplicated gemini_text / gemini_json across every bot module.
+
+All helpers are async and go through the client's ``aio`` API so concurrent
+/chat requests don't tie up FastAPI's threadpool while waiting on Gemini.
+Successful responses are kept in a bounded TTL cache keyed by prompt, and
+identical prompts already in flight share a single Gemini request.
 """
 
-import json
+import asyncio
+import hashlib
 import re
 import logging
-from typing import Optional
+from contextlib import aclosing
+from functools import cache, partial
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
+import orjson
+from cachetools import TTLCache
 from google import genai
+from google.genai.types import GenerateContentConfig, HttpOptions
 
-from config import GEMINI_API_KEY, GEMINI_MODELS
+from config import (
+    GEMINI_API_KEY,
+    GEMINI_CACHE_MAXSIZE,
+    GEMINI_CACHE_TTL,
+    GEMINI_HEDGE_DELAY,
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_MODELS,
+    GEMINI_MODELS_FAST,
+    GEMINI_TIMEOUT_MS,
+)
 
 logger = logging.getLogger(__name__)
 
-# Initialise client once at import time
-client = genai.Client(api_key=GEMINI_API_KEY)
+ERROR_PREFIX = "[Gemini API Error]"
+
+
+class GeminiError(Exception):
+    """Every model failed; status is the last HTTP status code, if known."""
+
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
 
+    @property
+    def transient(self) -> bool:
+        """Worth retrying: rate limits, server errors, network failures."""
+        return self.status is None or self.status == 429 or self.status >= 500
 
-def _gemini_call(prompt: str, json_mode: bool = False) -> str:
+
+@cache
+def _get_client() -> genai.Client:
     """
-    Call Gemini with automatic model fallback.
-    If json_mode=True, wraps prompt to coerce JSON-only output.
+    Create the Gemini client on first use rather than at import time.
+    Every call shares this one client, so its HTTP connection pool (and
+    TLS sessions) are reused across requests and fallback models.
+    """
+    return genai.Client(
+        api_key=GEMINI_API_KEY,
+        http_options=HttpOptions(timeout=GEMINI_TIMEOUT_MS),
+    )
+
+
+# (mode, fast, blake2b(prompt)) — mode is "text", "json" or "label"
+CacheKey = Tuple[str, bool, bytes]
+
+# Response cache + in-flight calls, so concurrent duplicates share one request
+_CACHE: TTLCache = TTLCache(maxsize=GEMINI_CACHE_MAXSIZE, ttl=GEMINI_CACHE_TTL)
+_INFLIGHT: Dict[CacheKey, "asyncio.Task[str]"] = {}
+# Callers currently awaiting each in-flight call
+_WAITERS: Dict["asyncio.Task[str]", int] = {}
+
+# A word followed by a delimiter means the first word is complete
+_FIRST_WORD_RE = re.compile(r"\w+\W")
+
+# Caps outgoing Gemini requests; cache hits and coalesced callers skip it
+_GEMINI_SEM = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+
+def _cache_key(
+    prompt: str, mode: str, fast: bool, system_instruction: str = ""
+) -> CacheKey:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(system_instruction.encode())
+    h.update(b"\0")
+    h.update(prompt.encode())
+    return mode, fast, h.digest()
+
+
+async def _call_model(
+    model_name: str,
+    prompt: str,
+    system_instruction: Optional[str] = None,
+    acquired: Optional[asyncio.Event] = None,
+) -> str:
+    """One generate_content call; sets `acquired` once it holds a slot."""
+    config = (
+        GenerateContentConfig(system_instruction=system_instruction)
+        if system_instruction
+        else None
+    )
+    async with _GEMINI_SEM:
+        if acquired is not None:
+            acquired.set()
+        resp = await _get_client().aio.models.generate_content(
+            model=model_name, contents=prompt, config=config
+        )
+    return (resp.text or "").strip()
+
+
+async def _generate(
+    prompt: str, models: List[str], system_instruction: Optional[str] = None
+) -> str:
     """
+    Try models in order, hedging slow calls: a model is started as
+    soon as the previous one fails, or after GEMINI_HEDGE_DELAY seconds
+    without an answer. The first non-empty reply wins; the rest are cancelled.
+    The hedge clock starts only once the latest call holds a _GEMINI_SEM
+    slot, so time spent queued under load never triggers an extra request.
+    """
+    remaining = list(models)
+    model_of: Dict["asyncio.Task[str]", str] = {}
+    pending: Set["asyncio.Task[str]"] = set()
+    acquired = asyncio.Event()
     last_error = None
-    for model_name in GEMINI_MODELS:
+
+    def start_next() -> None:
+        nonlocal acquired
+        model_name = remaining.pop(0)
+        acquired = asyncio.Event()
+        task = asyncio.create_task(
+            _call_model(model_name, prompt, system_instruction, acquired)
+        )
+        model_of[task] = model_name
+        pending.add(task)
+
+    start_next()
+    try:
+        while pending:
+            if remaining and not acquired.is_set():
+                # Still queued for a slot: wait for it (or for a result)
+                slot = asyncio.create_task(acquired.wait())
+                try:
+                    await asyncio.wait(
+                        pending | {slot}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    slot.cancel()
+                if not any(task.done() for task in pending):
+                    continue
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=GEMINI_HEDGE_DELAY if remaining else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                # Hedge: primary is slow, race the next model against it
+                logger.info("Gemini hedging with %s", remaining[0])
+                start_next()
+                continue
+            failed = False
+            for task in done:
+                pending.discard(task)
+                try:
+                    text = task.result()
+                except Exception as e:
+                    last_error = e
+                    failed = True
+                    logger.warning("Gemini model %s failed: %s", model_of[task], e)
+                    continue
+                if text:
+                    return text
+            # A failure (or an empty reply with nothing left running) moves
+            # straight on to the next model instead of waiting out the hedge
+            if remaining and (failed or not pending):
+                start_next()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if last_error:
+        code = getattr(last_error, "code", None)
+        raise GeminiError(
+            str(last_error), status=code if isinstance(code, int) else None
+        ) from last_error
+    return ""
+
+
+async def _stream_label(prompt: str, models: List[str]) -> str:
+    """
+    Stream the reply and stop as soon as the first whole word has arrived,
+    instead of waiting for the full completion.
+    """
+    for model_name in models:
+        buf = ""
         try:
-            if json_mode:
-                prompt_wrapped = (
-                    "Return ONLY valid JSON. Do not include markdown fences.\n"
-                    + prompt
-                )
-                resp = client.models.generate_content(
-                    model=model_name, contents=prompt_wrapped
-                )
-            else:
-                resp = client.models.generate_content(
+            async with _GEMINI_SEM:
+                stream = await _get_client().aio.models.generate_content_stream(
                     model=model_name, contents=prompt
                 )
-            text = (resp.text or "").strip()
-            if text:
-                return text
+                async with aclosing(stream):
+                    async for chunk in stream:
+                        buf += chunk.text or ""
+                        if _FIRST_WORD_RE.search(buf):
+                            break
         except Exception as e:
-            last_error = e
             logger.warning("Gemini model %s failed: %s", model_name, e)
             continue
-
-    # If all models failed, return the error so the user sees it
-    if last_error:
-        return f"[Gemini API Error] {last_error}"
+        words = buf.split()
+        if words:
+            return words[0]
     return ""
 
 
-def gemini_text(prompt: str) -> str:
+async def _single_flight(
+    key: CacheKey, make_call: Callable[[], Awaitable[str]]
+) -> str:
+    """
+    Serve from cache, or share one in-flight call among identical callers.
+    The call is cancelled once every caller waiting on it has been cancelled.
+    """
+    cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.create_task(make_call())
+        _INFLIGHT[key] = task
+        task.add_done_callback(partial(_finish_inflight, key))
+    # Shielded so one cancelled caller doesn't cancel the call for the others
+    _WAITERS[task] = _WAITERS.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        _WAITERS[task] -= 1
+        if not _WAITERS[task]:
+            del _WAITERS[task]
+            if not task.done():
+                # Unlist it first so an identical call arriving before the
+                # done-callback runs starts fresh instead of joining it
+                if _INFLIGHT.get(key) is task:
+                    del _INFLIGHT[key]
+                task.cancel()
+
+
+def _finish_inflight(key: CacheKey, task: "asyncio.Task[str]") -> None:
+    """Drop a finished call from _INFLIGHT and cache it if it succeeded."""
+    # A cancelled call may already have been replaced by a fresh one
+    if _INFLIGHT.get(key) is task:
+        del _INFLIGHT[key]
+    if task.cancelled() or task.exception() is not None:
+        return
+    text = task.result()
+    if text:
+        _CACHE[key] = text
+
+
+async def _gemini_call(
+    prompt: str,
+    json_mode: bool = False,
+    fast: bool = False,
+    system_instruction: Optional[str] = None,
+) -> str:
+    """
+    Call Gemini with automatic model fallback, serving repeats from cache.
+    If json_mode=True, wraps prompt to coerce JSON-only output.
+    If fast=True, uses GEMINI_MODELS_FAST (for short classifier-style calls).
+    system_instruction carries invariant bot rules separately from the
+    per-request prompt, so Gemini sees a stable prefix it can cache.
+    """
+    if json_mode:
+        prompt = "Return ONLY valid JSON. Do not include markdown fences.\n" + prompt
+
+    models = GEMINI_MODELS_FAST if fast else GEMINI_MODELS
+    key = _cache_key(
+        prompt, "json" if json_mode else "text", fast, system_instruction or ""
+    )
+    make_call = partial(_generate, prompt, models, system_instruction)
+    return await _single_flight(key, make_call)
+
+
+async def gemini_text(
+    prompt: str, fast: bool = False, system_instruction: Optional[str] = None
+) -> str:
     """Plain-text Gemini call with model fallback."""
-    return _gemini_call(prompt, json_mode=False)
+    try:
+        return await _gemini_call(
+            prompt, json_mode=False, fast=fast, system_instruction=system_instruction
+        )
+    except GeminiError as e:
+        # If all models failed, return the error so the user sees it
+        return f"{ERROR_PREFIX} {e}"
+
 
+async def gemini_text_ex(
+    prompt: str, fast: bool = False, system_instruction: Optional[str] = None
+) -> str:
+    """Like gemini_text, but raises GeminiError when every model fails."""
+    return await _gemini_call(
+        prompt, json_mode=False, fast=fast, system_instruction=system_instruction
+    )
 
-def gemini_json(prompt: str) -> Optional[dict]:
+
+async def gemini_label(prompt: str) -> str:
+    """
+    Single-word Gemini call on the fast models — streams the reply and
+    returns its first word as soon as it is complete ("" on failure).
+    """
+    key = _cache_key(prompt, "label", True)
+    make_call = partial(_stream_label, prompt, GEMINI_MODELS_FAST)
+    return await _single_flight(key, make_call)
+
+
+async def gemini_json(prompt: str, fast: bool = False) -> Optional[dict]:
     """JSON Gemini call — returns parsed dict or None."""
-    text = _gemini_call(prompt, json_mode=True)
+    try:
+        text = await _gemini_call(prompt, json_mode=True, fast=fast)
+    except GeminiError:
+        return None
     try:
         text = re.sub(r"^```(json)?|```$", "", text.strip(), flags=re.MULTILINE)
-        return json.loads(text)
+        return orjson.loads(text)
     except Exception:
         return None
@@ -5,14 +5,32 @@ Entry point for the multi-bot AI system.
 All queries are auto-routed — no manual bot selection endpoints.
 """
 
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
-from routers import classifier
+from middleware import AllowAllCORSMiddleware, CacheControlMiddleware
+from routers import classifier, genz
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load langdetect profiles now rather than on the first GenZ request
+    genz.warm_up_language_detection()
+    # Warm upstream DNS/TLS in the background; startup doesn't wait on it
+    priming = asyncio.create_task(genz.prime_http_connections())
+    yield
+    priming.cancel()
+    # Release pooled upstream connections (NewsAPI / TMDB / Wikipedia)
+    await genz.close_http_session()
+
 
 app = FastAPI(
     title="Integrated Bots – Gemini-Powered Multi-Bot AI System",
@@ -21,16 +39,17 @@ app = FastAPI(
         "(Banking, Cooking, Finance, GenZ Content, GPT Master) using Google Gemini."
     ),
     version="2.0.0",
+    lifespan=lifespan,
 )
 
+# ── Long-lived browser caching for /static/* ────────────────────
+app.add_middleware(CacheControlMiddleware, path_prefix="/static/")
+
+# ── GZip (long bot replies + index.html; added first so CORS wraps it) ──
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
+
 # ── CORS (allow all origins for development) ────────────────────
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(AllowAllCORSMiddleware)
 
 # ── Include the single auto-router ──────────────────────────────
 app.include_router(classifier.router)      # /chat
@@ -58,3 +77,18 @@ async def serve_ui():
 @app.get("/health", tags=["Health"])
 async def health_check():
     return {"status": "healthy"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop + httptools; uvloop has no Windows build, fall back to asyncio there.
+    # Workers default to 1 — the Gemini cache and concurrency cap are per-process.
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
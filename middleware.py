@@ -0,0 +1,84 @@
+"""
+Lightweight pure-ASGI middlewares.
+
+Each one is a plain ASGI callable that only touches the
+``http.response.start`` message, so no per-request task or Request
+object is created.
+"""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# ─── CORS ───────────────────────────────────────────────────────
+
+# Allow-all CORS without credentials ("*" with credentials is invalid per spec)
+_CORS_HEADERS = [(b"access-control-allow-origin", b"*")]
+_PREFLIGHT_HEADERS = _CORS_HEADERS + [
+    (b"access-control-allow-methods", b"*"),
+    (b"access-control-allow-headers", b"*"),
+    (b"access-control-max-age", b"600"),
+]
+
+
+class AllowAllCORSMiddleware:
+    """
+    Minimal allow-all CORS: answers preflight requests directly and adds
+    the allow-origin header to every other HTTP response.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and any(
+            name == b"access-control-request-method" for name, _ in scope["headers"]
+        ):
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": _PREFLIGHT_HEADERS,
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + _CORS_HEADERS
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
+# ─── Static asset caching ───────────────────────────────────────
+
+class CacheControlMiddleware:
+    """
+    Adds a Cache-Control header to successful responses whose path
+    starts with ``path_prefix`` (e.g. the /static mount).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path_prefix: str = "/static/",
+        cache_control: str = "public, max-age=31536000, immutable",
+    ) -> None:
+        self.app = app
+        self.path_prefix = path_prefix
+        self.header = (b"cache-control", cache_control.encode("latin-1"))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cache_control(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = list(message.get("headers", [])) + [self.header]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache_control)
@@ -4,6 +4,9 @@ Banking Bot — answer logic only (no direct endpoint).
 Called internally by the auto-router in classifier.py.
 """
 
+import re
+from functools import lru_cache
+
 from gemini_helpers import gemini_text
 
 # ── Rules (identical to original) ────────────────────────────────
@@ -24,19 +27,29 @@ AUTH_KEYWORDS = [
     "my limit", "my credit",
 ]
 
+# All auth keywords in one compiled pattern — a single pass over the query.
+# Whole words only, so "my card" doesn't fire on "my cardio".
+_AUTH_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, AUTH_KEYWORDS)) + r")\b", re.IGNORECASE
+)
+
+
+_PROMPT_PREFIX = BANKING_RULES + "\n\nUser query: "
+_PROMPT_SUFFIX = "\n\nRespond with a concise banking FAQ answer."
 
+
+@lru_cache(maxsize=1024)
 def _build_prompt(user_query: str) -> str:
-    return (
-        BANKING_RULES
-        + "\n\nUser query: "
-        + user_query.strip()
-        + "\n\nRespond with a concise banking FAQ answer."
-    )
+    return f"{_PROMPT_PREFIX}{user_query.strip()}{_PROMPT_SUFFIX}"
+
+
+def requires_auth(user_query: str) -> bool:
+    """True if the query asks about the user's own account data."""
+    return _AUTH_RE.search(user_query) is not None
 
 
-def banking_answer(user_query: str) -> str:
-    lower = user_query.lower()
-    if any(k in lower for k in AUTH_KEYWORDS):
+async def banking_answer(user_query: str) -> str:
+    if requires_auth(user_query):
         return "Authentication required."
-    out = gemini_text(_build_prompt(user_query))
+    out = await gemini_text(_build_prompt(user_query))
     return out or "I don't have that information."
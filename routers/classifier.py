@@ -2,17 +2,22 @@
 Auto-Router — the single /chat endpoint that routes every query
 to the correct bot automatically.
 
-Uses Gemini LLM classification to decide which specialist bot handles each query.
+Routing is hybrid: a rule-based keyword pass handles unambiguous queries
+with no API call, and Gemini LLM classification decides the rest.
 """
 
+import asyncio
 import re
+from collections import Counter
+from typing import Dict, Optional
+
 from fastapi import APIRouter
 
-from gemini_helpers import gemini_text
+from gemini_helpers import gemini_label
 from schemas import ChatRequest, RoutedResponse
 
 # Import answer functions from sibling modules
-from routers.banking import banking_answer
+from routers.banking import banking_answer, requires_auth
 from routers.cooking import cooking_answer
 from routers.finance import finance_answer
 from routers.gpt_master import gpt_master_answer
@@ -26,7 +31,7 @@ router = APIRouter(tags=["Auto-Router"])
 ALLOWED_BOTS = {"banking", "cooking", "finance", "genz", "gpt_master", "unknown"}
 
 
-def classify_bot(user_query: str) -> str:
+async def gemini_classify(user_query: str) -> str:
     """Use Gemini to classify which bot should handle the user query."""
     instruction = """
 You are a router for a unified assistant.
@@ -40,22 +45,127 @@ Bots:
 
 Return ONLY one lowercase word.
 """
-    raw = gemini_text(instruction + f"\nUser query: {user_query}")
+    raw = await gemini_label(instruction + f"\nUser query: {user_query}")
     label = (raw or "").lower().strip()
     label = re.sub(r"[^a-z_]", "", label)
     return label if label in ALLOWED_BOTS else "unknown"
 
 
+# ─── Rule-based keyword routing ─────────────────────────────────
+
+# Regex fragments matched as whole words; inflections are listed explicitly
+# so e.g. "invest" doesn't fire on "investigated" or "stock" on "Stockholm".
+ROUTE_KEYWORDS = {
+    "banking": [
+        r"banks?", r"banking", "kyc", r"loans?", r"credit cards?", r"debit cards?",
+        r"cheques?", "ifsc", r"overdrafts?", r"savings accounts?", r"fixed deposits?",
+    ],
+    "cooking": [
+        r"recipes?", r"cook(?:s|ed|ing)?", r"bak(?:e|es|ed|ing)", r"ingredients?",
+        r"dish(?:es)?", r"boil(?:s|ed|ing)?", r"(?:fry|fries|fried|frying)",
+        r"grill(?:s|ed|ing)?", r"dinners?", r"breakfasts?",
+    ],
+    "finance": [
+        r"invest(?:s|ed|ing|ment|ments|or|ors)?", r"stocks?", r"bonds",
+        r"mutual funds?", r"portfolios?", r"diversif(?:y|ied|ying|ication)",
+        "compound interest", "inflation", r"budget(?:s|ing)?", "retirement",
+    ],
+    "genz": [
+        r"reels?", "tiktok", "instagram", r"captions?", r"hashtags?",
+        r"youtube shorts?", r"memes?", "viral", r"linkedin posts?", r"vlogs?",
+    ],
+}
+
+
+# A single hit is too ambiguous to skip Gemini ("chicken stock", "river bank")
+MIN_ROUTE_HITS = 2
+
+# One compiled alternation with a named group per bot, so a single
+# finditer() pass over the query tallies hits for every bot at once.
+_ROUTE_RE = re.compile(
+    "|".join(
+        f"(?P<{bot}>" + r"\b(?:" + "|".join(keywords) + r")\b)"
+        for bot, keywords in ROUTE_KEYWORDS.items()
+    ),
+    re.IGNORECASE,
+)
+
+
+def keyword_route(user_query: str) -> Optional[str]:
+    """
+    Rule-based routing. Strong signals win outright: account-data questions
+    go to banking (unless another bot's keywords also hit, e.g. "my account
+    on TikTok", which is left to Gemini) and detailed script requests to
+    genz. Otherwise returns the bot with the most keyword hits, provided it
+    has at least MIN_ROUTE_HITS of them and no other bot ties it; else None.
+    """
+    scores = Counter(m.lastgroup for m in _ROUTE_RE.finditer(user_query))
+    if requires_auth(user_query):
+        return "banking" if scores.keys() <= {"banking"} else None
+    if is_detailed_script_request(user_query):
+        return "genz"
+
+    ranked = scores.most_common(2)
+    if not ranked or ranked[0][1] < MIN_ROUTE_HITS:
+        return None
+    if len(ranked) == 2 and ranked[0][1] == ranked[1][1]:
+        return None
+    return ranked[0][0]
+
+
 # ─── Detailed script detection ──────────────────────────────────
 
+SCRIPT_KEYWORDS = [
+    "platform", "duration", "script", "camera", "gesture", "hashtags",
+    "reel", "tiktok", "youtube", "linkedin", "voiceover", "dialogue",
+    "tutorial", "comedy", "listicle",
+]
+
+_SCRIPT_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, SCRIPT_KEYWORDS)) + r")s?\b", re.IGNORECASE
+)
+
+
 def is_detailed_script_request(query: str) -> bool:
-    keywords = [
-        "platform", "duration", "script", "camera", "gesture", "hashtags",
-        "reel", "tiktok", "youtube", "linkedin", "voiceover", "dialogue",
-        "tutorial", "comedy", "listicle",
-    ]
-    q = query.lower()
-    return sum(1 for k in keywords if k in q) >= 2 or "script" in q
+    """
+    True on two or more distinct content-creator signals. "script" alone
+    doesn't count — "a Python script" is not a TikTok request.
+    """
+    hits = {m.lower() for m in _SCRIPT_RE.findall(query)}
+    hits.discard("script")
+    return len(hits) >= 2
+
+
+# ─── Dispatch ───────────────────────────────────────────────────
+
+async def dispatch(bot: str, user_query: str) -> str:
+    """Run the answer function for the given bot label."""
+    if bot == "banking":
+        return await banking_answer(user_query)
+    if bot == "cooking":
+        return await cooking_answer(user_query)
+    if bot == "finance":
+        return await finance_answer(user_query)
+    if bot == "genz":
+        reply_txt, _ = await genz_bot_org(user_query)
+        return reply_txt
+    if bot == "gpt_master":
+        return await gpt_master_answer(user_query)
+    return "Please rephrase your question clearly."
+
+
+def _routed(bot: str, reply: str) -> Dict[str, str]:
+    # Plain dict: FastAPI validates it against response_model=RoutedResponse
+    # and serializes it straight to JSON bytes through pydantic.
+    return {"bot": bot, "reply": reply, "routed_to": bot}
+
+
+async def _cancel(task: asyncio.Task) -> None:
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
 
 
 # ─── Endpoint ───────────────────────────────────────────────────
@@ -64,24 +174,31 @@ def is_detailed_script_request(query: str) -> bool:
 async def chat_endpoint(req: ChatRequest):
     """
     Auto-routed chat — the sole entry point for all user queries:
-    1. classify_bot() decides which bot to use
-    2. Dispatches to the matching answer function
+    1. keyword_route() handles unambiguous queries without an API call
+    2. Otherwise gemini_classify() runs while gpt_master_answer() is started
+       speculatively; its reply is reused if gpt_master wins, else cancelled
     3. Returns the bot label + reply
     """
-    bot = classify_bot(req.query)
-
-    if bot == "banking":
-        reply = banking_answer(req.query)
-    elif bot == "cooking":
-        reply = cooking_answer(req.query)
-    elif bot == "finance":
-        reply = finance_answer(req.query)
-    elif bot == "genz":
-        reply_txt, _ = genz_bot_org(req.query)
-        reply = reply_txt
-    elif bot == "gpt_master":
-        reply = gpt_master_answer(req.query)
+    # Already stripped by ChatRequest; the matchers below are case-insensitive
+    query = req.query
+
+    bot = keyword_route(query)
+    if bot is not None:
+        reply = await dispatch(bot, query)
+        return _routed(bot, reply)
+
+    classify_task = asyncio.create_task(gemini_classify(query))
+    fallback_task = asyncio.create_task(gpt_master_answer(query))
+    try:
+        bot = await classify_task
+    except BaseException:
+        await _cancel(fallback_task)
+        raise
+
+    if bot == "gpt_master":
+        reply = await fallback_task
     else:
-        reply = "Please rephrase your question clearly."
+        await _cancel(fallback_task)
+        reply = await dispatch(bot, query)
 
-    return RoutedResponse(bot=bot, reply=reply, routed_to=bot)
+    return _routed(bot, reply)
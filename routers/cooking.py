@@ -4,6 +4,8 @@ Cooking Bot — answer logic only (no direct endpoint).
 Called internally by the auto-router in classifier.py.
 """
 
+from functools import lru_cache
+
 from gemini_helpers import gemini_text
 
 # ── Rules (identical to original) ────────────────────────────────
@@ -26,17 +28,17 @@ FALLBACK_MSG = (
 )
 
 
+_PROMPT_PREFIX = COOKING_RULES + "\n\nUser request: "
+_PROMPT_SUFFIX = "\n\nRespond ONLY with the required structure."
+
+
+@lru_cache(maxsize=1024)
 def _build_prompt(user_query: str) -> str:
-    return (
-        COOKING_RULES
-        + "\n\nUser request: "
-        + user_query.strip()
-        + "\n\nRespond ONLY with the required structure."
-    )
+    return f"{_PROMPT_PREFIX}{user_query.strip()}{_PROMPT_SUFFIX}"
 
 
-def cooking_answer(user_query: str) -> str:
+async def cooking_answer(user_query: str) -> str:
     if len(user_query.split()) < 2:
         return FALLBACK_MSG
-    out = gemini_text(_build_prompt(user_query))
+    out = await gemini_text(_build_prompt(user_query))
     return out if out else FALLBACK_MSG
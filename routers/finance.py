@@ -4,6 +4,8 @@ Finance Bot — answer logic only (no direct endpoint).
 Called internally by the auto-router in classifier.py.
 """
 
+from functools import lru_cache
+
 from gemini_helpers import gemini_text
 
 # ── Rules (identical to original) ────────────────────────────────
@@ -27,17 +29,17 @@ FALLBACK_MSG = (
 DISCLAIMER = "\n\nDisclaimer: This is educational information only, not financial advice."
 
 
+_PROMPT_PREFIX = FINANCE_RULES + "\n\nUser question: "
+_PROMPT_SUFFIX = "\n\nGive a concise conceptual explanation and then the disclaimer."
+
+
+@lru_cache(maxsize=1024)
 def _build_prompt(user_query: str) -> str:
-    return (
-        FINANCE_RULES
-        + "\n\nUser question: "
-        + user_query.strip()
-        + "\n\nGive a concise conceptual explanation and then the disclaimer."
-    )
+    return f"{_PROMPT_PREFIX}{user_query.strip()}{_PROMPT_SUFFIX}"
 
 
-def finance_answer(user_query: str) -> str:
-    out = gemini_text(_build_prompt(user_query))
+async def finance_answer(user_query: str) -> str:
+    out = await gemini_text(_build_prompt(user_query))
     if out:
         if "educational information only" not in out.lower():
             out += DISCLAIMER
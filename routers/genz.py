@@ -12,22 +12,62 @@ Preserves:
 Called internally by the auto-router in classifier.py.
 """
 
-from typing import Dict, Any, List
+import asyncio
+import heapq
+import re
+from datetime import date
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+from urllib.parse import quote
+
+import aiohttp
+import orjson
+from cachetools import TTLCache
+
+from config import (
+    NEWS_API_KEY,
+    TMDB_API_KEY,
+    WIKI_HEADERS,
+    WIKI_SEARCH_URL,
+    WIKI_SUMMARY_URL,
+)
+from gemini_helpers import (
+    GeminiError,
+    gemini_json,
+    gemini_text,
+    gemini_text_ex,
+)
+
+
+T = TypeVar("T")
 
-import requests
-from langdetect import detect
 
-from config import NEWS_API_KEY, TMDB_API_KEY, WIKI_SUMMARY_URL, WIKI_HEADERS
-from gemini_helpers import gemini_text, gemini_json
+# ─── Internal Sub-Classifier ────────────────────────────────────
 
+# Categories keyed by normalized query, so case / spacing variants of a
+# repeated query skip the Gemini round trip
+_CATEGORY_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+
+_VALID_CATEGORIES = frozenset({
+    "social_media", "news", "movies", "quotes",
+    "general_knowledge", "mixed", "unrelated",
+})
 
-# ─── Internal Sub-Classifier ────────────────────────────────────
 
-def classify_query_with_gemini(user_query: str) -> str:
+def _normalize(user_query: str) -> str:
+    return " ".join(user_query.lower().split())[:512]
+
+
+async def classify_query_with_gemini(user_query: str) -> str:
     """
     Returns exactly one of:
     social_media, news, movies, quotes, general_knowledge, mixed, unrelated
     """
+    user_query = _normalize(user_query)
+    cached = _CATEGORY_CACHE.get(user_query)
+    if cached is not None:
+        return cached
+
     prompt = f"""
 Classify the user query into exactly ONE of the following categories:
 - social_media
@@ -52,102 +92,300 @@ Return JSON only:
 
 User query: "{user_query}"
 """
-    js = gemini_json(prompt)
-    category = (js or {}).get("category", "unrelated").strip().lower()
-    valid = {
-        "social_media", "news", "movies", "quotes",
-        "general_knowledge", "mixed", "unrelated",
-    }
-    return category if category in valid else "unrelated"
+    js = await gemini_json(prompt, fast=True)
+    if not isinstance(js, dict):
+        # Gemini failed or returned garbage — don't cache the fallback
+        return "unrelated"
+    category = str(js.get("category", "")).strip().lower()
+    if category not in _VALID_CATEGORIES:
+        category = "unrelated"
+    _CATEGORY_CACHE[user_query] = category
+    return category
 
 
 # ─── External API Handlers ──────────────────────────────────────
 
-def newsapi_search(
+# One pooled aiohttp session for NewsAPI / TMDB / Wikipedia: keep-alive
+# connections are reused and the event loop is free during upstream waits
+_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=12)
+# Short so the Gemini fallback in wikipedia_summary kicks in quickly
+_WIKI_TIMEOUT = aiohttp.ClientTimeout(total=4)
+_session: Optional[aiohttp.ClientSession] = None
+
+# Upstream response caches — only non-empty results are stored
+_NEWS_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=300)
+_TMDB_CACHE: TTLCache = TTLCache(maxsize=2048, ttl=3600)
+_WIKI_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=86400)
+_WIKI_TITLE_CACHE: TTLCache = TTLCache(maxsize=4096, ttl=86400)
+# Upstream fetches in flight, so concurrent identical misses share one
+_FETCHES: Dict[Any, "asyncio.Task[Any]"] = {}
+
+# Only this many results are kept (and cached) per TMDB call
+MOVIE_RESULTS = 5
+TRENDING_RESULTS = 10
+
+
+# Transient gateway errors are retried with backoff (2 retries)
+_HTTP_ATTEMPTS = 3
+_RETRY_STATUSES = frozenset({502, 503, 504})
+
+# Hit once at startup so DNS + TLS are warm before the first request
+_UPSTREAM_HOSTS = (
+    "https://newsapi.org",
+    "https://api.themoviedb.org",
+    "https://en.wikipedia.org",
+)
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Shared session, created on first use inside the running event loop."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=32,
+                limit_per_host=8,
+                keepalive_timeout=75,
+                ttl_dns_cache=300,  # default is 10s; upstream hosts are fixed
+            ),
+        )
+    return _session
+
+
+async def _get_json(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: aiohttp.ClientTimeout = _HTTP_TIMEOUT,
+) -> Any:
+    """
+    GET and decode a JSON body through the shared session. Retries
+    502/503/504 with backoff; returns None for any other non-200 status.
+    """
+    for attempt in range(_HTTP_ATTEMPTS):
+        async with _get_session().get(
+            url, params=params, headers=headers, timeout=timeout
+        ) as r:
+            if r.status == 200:
+                return orjson.loads(await r.read())
+            if r.status not in _RETRY_STATUSES or attempt == _HTTP_ATTEMPTS - 1:
+                return None
+        await asyncio.sleep(0.2 * 2 ** attempt)
+    return None
+
+
+async def prime_http_connections() -> None:
+    """Open a pooled connection to each upstream host; failures are ignored."""
+    session = _get_session()
+
+    async def prime(url: str) -> None:
+        async with session.head(url, timeout=aiohttp.ClientTimeout(total=3)):
+            pass
+
+    await asyncio.gather(*(prime(u) for u in _UPSTREAM_HOSTS), return_exceptions=True)
+
+
+async def close_http_session() -> None:
+    """Close the shared session — called from the app lifespan on shutdown."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+def _finish_fetch(
+    cache: TTLCache, key: Any, flight: Any, task: "asyncio.Task[Any]"
+) -> None:
+    """Drop a finished fetch from _FETCHES and cache a non-empty result."""
+    if _FETCHES.get(flight) is task:
+        del _FETCHES[flight]
+    if task.cancelled() or task.exception() is not None:
+        return
+    result = task.result()
+    if result:
+        cache[key] = result
+
+
+async def _cached_fetch(
+    cache: TTLCache, key: Any, fetch: Callable[[], Awaitable[T]]
+) -> T:
+    """
+    Serve from cache, or share one upstream fetch among concurrent identical
+    misses (the fetch awaits, so separate misses would each go upstream).
+    Only non-empty results are cached.
+    """
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    flight = (id(cache), key)
+    task = _FETCHES.get(flight)
+    if task is None:
+        task = asyncio.create_task(fetch())
+        _FETCHES[flight] = task
+        task.add_done_callback(partial(_finish_fetch, cache, key, flight))
+    # Shielded so a cancelled caller doesn't fail the fetch for the others
+    return await asyncio.shield(task)
+
+
+async def newsapi_search(
     query: str, page_size: int = 5, language: str = "en"
 ) -> List[Dict[str, str]]:
-    url = "https://newsapi.org/v2/everything"
-    params = {
-        "q": query,
-        "language": language,
-        "pageSize": page_size,
-        "apiKey": NEWS_API_KEY,
-        "sortBy": "publishedAt",
-    }
-    try:
-        r = requests.get(url, params=params, timeout=12)
-        data = r.json()
-        return [
-            {"title": a.get("title", "").strip(), "url": a.get("url", "").strip()}
-            for a in data.get("articles", [])
-            if a.get("title") and a.get("url")
-        ]
-    except Exception:
-        return []
+    async def fetch() -> List[Dict[str, str]]:
+        url = "https://newsapi.org/v2/everything"
+        params = {
+            "q": query,
+            "language": language,
+            "pageSize": page_size,
+            "apiKey": NEWS_API_KEY,
+            "sortBy": "publishedAt",
+        }
+        try:
+            data = await _get_json(url, params=params) or {}
+            return [
+                {"title": a.get("title", "").strip(), "url": a.get("url", "").strip()}
+                for a in data.get("articles", [])
+                if a.get("title") and a.get("url")
+            ]
+        except Exception:
+            return []
 
+    return await _cached_fetch(_NEWS_CACHE, (query, page_size, language), fetch)
 
-def tmdb_search_movie(
+
+async def tmdb_search_movie(
     title: str, language: str = "en-US", include_adult: bool = False
 ) -> List[Dict[str, Any]]:
-    url = "https://api.themoviedb.org/3/search/movie"
-    params = {
-        "api_key": TMDB_API_KEY,
-        "query": title,
-        "language": language,
-        "include_adult": str(include_adult).lower(),
-    }
-    try:
-        r = requests.get(url, params=params, timeout=12)
-        data = r.json()
-        results = data.get("results", []) or []
-        results.sort(key=lambda x: x.get("popularity", 0), reverse=True)
-        return results
-    except Exception:
-        return []
+    async def fetch() -> List[Dict[str, Any]]:
+        url = "https://api.themoviedb.org/3/search/movie"
+        params = {
+            "api_key": TMDB_API_KEY,
+            "query": title,
+            "language": language,
+            "include_adult": str(include_adult).lower(),
+        }
+        try:
+            data = await _get_json(url, params=params) or {}
+            # Callers only show the top few — partial selection, not a full sort
+            return heapq.nlargest(
+                MOVIE_RESULTS,
+                data.get("results", []) or [],
+                key=lambda x: x.get("popularity") or 0.0,  # TMDB may send null
+            )
+        except Exception:
+            return []
 
+    key = ("search", title, language, include_adult)
+    return await _cached_fetch(_TMDB_CACHE, key, fetch)
 
-def tmdb_trending_fallback() -> List[Dict[str, Any]]:
-    url = "https://api.themoviedb.org/3/trending/movie/day"
-    params = {"api_key": TMDB_API_KEY}
-    try:
-        r = requests.get(url, params=params, timeout=12)
-        data = r.json()
-        return data.get("results", []) or []
-    except Exception:
-        return []
 
+async def tmdb_trending_fallback() -> List[Dict[str, Any]]:
+    async def fetch() -> List[Dict[str, Any]]:
+        url = "https://api.themoviedb.org/3/trending/movie/day"
+        params = {"api_key": TMDB_API_KEY}
+        try:
+            data = await _get_json(url, params=params) or {}
+            return (data.get("results", []) or [])[:TRENDING_RESULTS]
+        except Exception:
+            return []
 
-def wikipedia_summary(topic: str) -> str:
-    try:
-        r = requests.get(
-            WIKI_SUMMARY_URL + requests.utils.quote(topic),
-            headers=WIKI_HEADERS,
-            timeout=10,
-        )
-        if r.status_code == 200:
-            extract = r.json().get("extract", "").strip()
-            if extract:
-                return extract
-    except Exception:
-        pass
+    # Trending is a daily list, so key it on the date
+    key = ("trending", date.today().isoformat())
+    return await _cached_fetch(_TMDB_CACHE, key, fetch)
+
+
+async def wikipedia_title(topic: str) -> str:
+    """
+    Canonical article title for the topic via MediaWiki opensearch, so the
+    summary request doesn't 404 on titles that need normalization.
+    Falls back to the topic itself.
+    """
+    async def fetch() -> str:
+        params = {"action": "opensearch", "search": topic, "limit": 1, "format": "json"}
+        try:
+            data = await _get_json(
+                WIKI_SEARCH_URL,
+                params=params,
+                headers=WIKI_HEADERS,
+                timeout=_WIKI_TIMEOUT,
+            ) or []
+            titles = data[1] if len(data) > 1 else []
+        except Exception:
+            return ""
+        return titles[0] if titles else ""
+
+    return await _cached_fetch(_WIKI_TITLE_CACHE, topic, fetch) or topic
+
+
+async def wikipedia_extract(topic: str) -> str:
+    """Wikipedia summary extract for the topic, or "" if unavailable."""
+    async def fetch() -> str:
+        title = await wikipedia_title(topic)
+        try:
+            # safe="" so a "/" inside the title stays part of the path segment
+            data = await _get_json(
+                f"{WIKI_SUMMARY_URL}{quote(title, safe='')}",
+                headers=WIKI_HEADERS,
+                timeout=_WIKI_TIMEOUT,
+            ) or {}
+            return data.get("extract", "").strip()
+        except Exception:
+            return ""
+
+    return await _cached_fetch(_WIKI_CACHE, topic, fetch)
+
+
+async def wikipedia_summary(topic: str) -> str:
+    extract = await wikipedia_extract(topic)
+    if extract:
+        return extract
     # Fallback to Gemini-generated content
     fallback_prompt = (
         f"Generate a GenZ style Instagram carousel caption about '{topic}', "
         "with minimal emojis and engaging tone."
     )
-    return gemini_text(fallback_prompt)
+    return await gemini_text(fallback_prompt)
 
 
 # ─── Language Detection ──────────────────────────────────────────
 
+# Codes langdetect can return — an explicit one is used as-is
+_ISO_LANGS = frozenset({
+    "af", "ar", "bg", "bn", "ca", "cs", "cy", "da", "de", "el", "en", "es",
+    "et", "fa", "fi", "fr", "gu", "he", "hi", "hr", "hu", "id", "it", "ja",
+    "kn", "ko", "lt", "lv", "mk", "ml", "mr", "ne", "nl", "no", "pa", "pl",
+    "pt", "ro", "ru", "sk", "sl", "so", "sq", "sv", "sw", "ta", "te", "th",
+    "tl", "tr", "uk", "ur", "vi", "zh", "zh-cn", "zh-tw",
+})
+
+
+_detect = None
+
+
+def _get_detect():
+    """Import langdetect on first use, with a fixed seed for repeatable results."""
+    global _detect
+    if _detect is None:
+        from langdetect import DetectorFactory, detect
+
+        DetectorFactory.seed = 0
+        _detect = detect
+    return _detect
+
+
+def warm_up_language_detection() -> None:
+    """Load langdetect's language profiles before the first request needs them."""
+    _get_detect()("warm up the language profiles")
+
+
 def detect_language(text: str) -> str:
     try:
         if not text or text.strip().lower() == "auto":
             return "en"
         text = text.strip().lower()
-        if len(text) <= 5 and text.isalpha():
+        if text in _ISO_LANGS or (len(text) <= 5 and text.isalpha()):
             return text
-        return detect(text)
+        return _get_detect()(text)
     except Exception:
         return "en"
 
@@ -164,6 +402,62 @@ SOCIAL_PLATFORMS = {
 }
 
 
+# Keyword → platform, in priority order: when several keywords appear,
+# the one listed first here wins (not the one mentioned first)
+PLATFORM_KEYWORDS = {
+    "instagram": "instagram_reel",
+    "reel": "instagram_reel",
+    "linkedin": "linkedin_post",
+    "thread": "x_thread",
+    "twitter": "x_thread",
+    "x ": "x_thread",
+    "youtube": "youtube_short",
+    "short": "youtube_short",
+    "whatsapp": "whatsapp_status",
+    "tiktok": "tiktok",
+}
+
+_PLATFORM_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, PLATFORM_KEYWORDS)) + ")", re.IGNORECASE
+)
+_PLATFORM_PRIORITY = {k: i for i, k in enumerate(PLATFORM_KEYWORDS)}
+
+
+def detect_platform(user_query: str) -> str:
+    """Map a query to a platform in one regex pass, keeping keyword priority."""
+    hits = {m.lower() for m in _PLATFORM_RE.findall(user_query)}
+    if not hits:
+        return "instagram_reel"
+    return PLATFORM_KEYWORDS[min(hits, key=_PLATFORM_PRIORITY.__getitem__)]
+
+
+# Invariant creator instructions — sent as the Gemini system instruction
+GENZ_INSTRUCTION = (
+    "👉 You are a Gen-Z short-video content creator. Generate a scroll-stopping script "
+    "with strong hook in first 3 seconds, energetic pacing, slang, emojis. "
+    "If camera cues requested, give second-by-second instructions (close-up/mid/wide + gestures). "
+    "If trending is enabled, suggest 2-3 trending sounds and hashtags. "
+    "Keep it conversational, funny, and relatable. Always end with a clear CTA."
+)
+
+
+# Whole prompt in one template; optional lines carry their own separator
+_AUGMENTED_PROMPT_TEMPLATE = (
+    "🎯 User idea: {user_prompt}\n\n"
+    "📱 Platform: {platform} → {platform_desc}\n\n"
+    "⏱ Target duration: {duration} seconds\n\n"
+    "🎬 Content type: {content_type}\n\n"
+    "{area_spec_line}"
+    "{location_line}"
+    "🌐 Language: {language}\n\n"
+    "🌀 Tone: {tone} (always Gen-Z slang, memes, FOMO hooks)\n\n"
+    "🔥 Include trending suggestions: {include_trending}\n\n"
+    "🎥 Include camera cues & gestures: {deliver_camera_cues}\n\n"
+    "📊 Compare with trending reels: {compare_with_reels}"
+)
+_DEFAULT_PLATFORM_DESC = SOCIAL_PLATFORMS["instagram_reel"]
+
+
 def _build_augmented_prompt(
     user_prompt: str,
     platform: str,
@@ -177,39 +471,28 @@ def _build_augmented_prompt(
     deliver_camera_cues: bool,
     compare_with_reels: bool,
 ) -> str:
-    platform_desc = SOCIAL_PLATFORMS.get(platform, SOCIAL_PLATFORMS["instagram_reel"])
-
-    parts = [
-        f"🎯 User idea: {user_prompt}",
-        f"📱 Platform: {platform} → {platform_desc}",
-        f"⏱ Target duration: {duration} seconds",
-        f"🎬 Content type: {content_type}",
-    ]
-    if area_spec:
-        parts.append(f"🍲 Specific focus: {area_spec}")
-    if location:
-        parts.append(f"📍 Location: {location}")
-    parts.append(f"🌐 Language: {language}")
-    parts.append(f"🌀 Tone: {tone} (always Gen-Z slang, memes, FOMO hooks)")
-    parts.append(f"🔥 Include trending suggestions: {'yes' if include_trending else 'no'}")
-    parts.append(f"🎥 Include camera cues & gestures: {'yes' if deliver_camera_cues else 'no'}")
-    parts.append(f"📊 Compare with trending reels: {'yes' if compare_with_reels else 'no'}")
-
-    inst = (
-        "👉 You are a Gen-Z short-video content creator. Generate a scroll-stopping script "
-        "with strong hook in first 3 seconds, energetic pacing, slang, emojis. "
-        "If camera cues requested, give second-by-second instructions (close-up/mid/wide + gestures). "
-        "If trending is enabled, suggest 2-3 trending sounds and hashtags. "
-        "Keep it conversational, funny, and relatable. Always end with a clear CTA."
+    return _AUGMENTED_PROMPT_TEMPLATE.format(
+        user_prompt=user_prompt,
+        platform=platform,
+        platform_desc=SOCIAL_PLATFORMS.get(platform, _DEFAULT_PLATFORM_DESC),
+        duration=duration,
+        content_type=content_type,
+        area_spec_line=f"🍲 Specific focus: {area_spec}\n\n" if area_spec else "",
+        location_line=f"📍 Location: {location}\n\n" if location else "",
+        language=language,
+        tone=tone,
+        include_trending="yes" if include_trending else "no",
+        deliver_camera_cues="yes" if deliver_camera_cues else "no",
+        compare_with_reels="yes" if compare_with_reels else "no",
     )
-    parts.append(inst)
-
-    return "\n\n".join(parts)
 
 
 # ─── Core GenZ Bot Logic ────────────────────────────────────────
 
-def genz_bot_org(
+GEMINI_ATTEMPTS = 2  # transient failures only
+
+
+async def genz_bot_org(
     user_prompt: str,
     platform: str = "instagram_reel",
     duration: int = 30,
@@ -239,28 +522,24 @@ def genz_bot_org(
         compare_with_reels=compare_with_reels,
     )
 
-    # Primary attempt
-    try:
-        out = gemini_text(augmented_prompt)
-        if out and isinstance(out, str) and out.strip():
-            return (
-                f"🌐 Language detected/selected: {lang_detected}\n\n{out.strip()}",
-                lang_detected,
-            )
-    except Exception:
-        pass
-
-    # Fallback attempt
-    try:
-        fallback_prompt = "Return a compact GenZ style script:\n\n" + augmented_prompt
-        out2 = gemini_text(fallback_prompt)
-        if out2 and out2.strip():
-            return (
-                f"🌐 Language detected/selected: {lang_detected}\n\n{out2.strip()}",
-                lang_detected,
+    # Retry only transient failures (429 / 5xx / network) with backoff;
+    # a 4xx won't change on a near-identical re-send
+    out = ""
+    for attempt in range(GEMINI_ATTEMPTS):
+        try:
+            out = await gemini_text_ex(
+                augmented_prompt, system_instruction=GENZ_INSTRUCTION
             )
-    except Exception:
-        pass
+            break
+        except GeminiError as e:
+            if not e.transient or attempt == GEMINI_ATTEMPTS - 1:
+                break
+            await asyncio.sleep(0.2 * 2 ** attempt)
+    if out:
+        return (
+            f"🌐 Language detected/selected: {lang_detected}\n\n{out}",
+            lang_detected,
+        )
 
     # Last resort template
     safe_template = (
@@ -274,44 +553,94 @@ def genz_bot_org(
     return safe_template, lang_detected
 
 
+# ─── Mixed-source fan-out ───────────────────────────────────────
+
+MIXED_SOURCE_TIMEOUT = 5  # seconds, applied to each source separately
+
+
+async def _within_timeout(coro: Awaitable[T], default: T) -> T:
+    try:
+        return await asyncio.wait_for(coro, MIXED_SOURCE_TIMEOUT)
+    except asyncio.TimeoutError:
+        return default
+
+
+async def _fetch_mixed_context(query: str) -> Dict[str, Any]:
+    """
+    Query NewsAPI, TMDB and Wikipedia concurrently. Each source has its own
+    timeout, so a slow one is dropped without holding back the others.
+    """
+    news, movies, wiki = await asyncio.gather(
+        _within_timeout(newsapi_search(query), []),
+        _within_timeout(tmdb_search_movie(query), []),
+        _within_timeout(wikipedia_extract(query), ""),
+    )
+    return {"news": news, "movies": movies, "wiki": wiki}
+
+
+def _format_mixed_context(ctx: Dict[str, Any]) -> str:
+    parts = []
+    if ctx.get("news"):
+        lines = [f"- {a['title']}" for a in ctx["news"][:5]]
+        parts.append("Latest headlines:\n" + "\n".join(lines))
+    if ctx.get("movies"):
+        lines = [
+            f"- {m.get('title', 'Unknown')} ({(m.get('release_date') or '')[:4]})"
+            for m in ctx["movies"]
+        ]
+        parts.append("Related movies:\n" + "\n".join(lines))
+    if ctx.get("wiki"):
+        parts.append("Background:\n" + ctx["wiki"])
+    return "\n\n".join(parts)
+
+
+async def handle_query_mixed(user_query: str) -> str:
+    """Combine news, movie and Wikipedia context into one GenZ reply."""
+    context = _format_mixed_context(await _fetch_mixed_context(user_query))
+    prompt = f"""
+        You are a GenZ content creator AI. Respond in a casual, trendy, and GenZ style.
+        User said: "{user_query}"
+        Use this context where it fits:
+        {context or "(no extra context available)"}
+        Respond creatively, keep it short, avoid excessive emojis.
+        Include hashtags and camera angles if fitting.
+        """
+    return await gemini_text(prompt) or "Couldn't come up with something GenZ enough."
+
+
 # ─── handle_query (preserves original routing for standalone use) ─
 
-def handle_query(user_query: str) -> str:
-    category = classify_query_with_gemini(user_query)
+# Greetings and near-empty input skip classification entirely
+_GREETINGS = frozenset({"hi", "hello", "hey", "yo", "sup", "hola"})
+_GREETING_REPLY = (
+    "yo what's good 👋 drop a topic, trend, movie or platform and I'll cook something up ✨"
+)
+
+
+async def handle_query(user_query: str) -> str:
+    q = user_query.strip().lower()
+    if len(q) < 4 or q in _GREETINGS:
+        return _GREETING_REPLY
+
+    category = await classify_query_with_gemini(user_query)
 
     if category == "social_media":
-        platform_map = {
-            "instagram": "instagram_reel",
-            "reel": "instagram_reel",
-            "linkedin": "linkedin_post",
-            "thread": "x_thread",
-            "twitter": "x_thread",
-            "x ": "x_thread",
-            "youtube": "youtube_short",
-            "short": "youtube_short",
-            "whatsapp": "whatsapp_status",
-            "tiktok": "tiktok",
-        }
-        platform = "instagram_reel"
-        for keyword, mapped_platform in platform_map.items():
-            if keyword in user_query.lower():
-                platform = mapped_platform
-                break
-        reply, _ = genz_bot_org(user_query, platform=platform, tone="genz")
+        platform = detect_platform(user_query)
+        reply, _ = await genz_bot_org(user_query, platform=platform, tone="genz")
         return reply
 
     elif category == "news":
-        articles = newsapi_search(user_query)
+        articles = await newsapi_search(user_query)
         if articles:
             lines = [f"- [{a['title']}]({a['url']})" for a in articles[:5]]
             return "📰 Latest news:\n" + "\n".join(lines)
         return "No news articles found for that query."
 
     elif category == "movies":
-        movies = tmdb_search_movie(user_query)
+        movies = await tmdb_search_movie(user_query)
         if movies:
             lines = []
-            for m in movies[:5]:
+            for m in movies:
                 title = m.get("title", "Unknown")
                 year = (m.get("release_date") or "")[:4]
                 rating = m.get("vote_average", "N/A")
@@ -320,7 +649,10 @@ def handle_query(user_query: str) -> str:
         return "No movies found for that query."
 
     elif category == "general_knowledge":
-        return wikipedia_summary(user_query)
+        return await wikipedia_summary(user_query)
+
+    elif category == "mixed":
+        return await handle_query_mixed(user_query)
 
     else:
         prompt = f"""
@@ -329,4 +661,4 @@ def handle_query(user_query: str) -> str:
             Respond creatively, add humor or wit as appropriate, keep it short, avoid excessive emojis.
             Include hashtags and camera angles if fitting.
             """
-        return gemini_text(prompt) or "Couldn't come up with something GenZ enough."
+        return await gemini_text(prompt) or "Couldn't come up with something GenZ enough."
@@ -4,6 +4,8 @@ GPT Master Bot — answer logic only (no direct endpoint).
 Called internally by the auto-router in classifier.py.
 """
 
+from functools import lru_cache
+
 from gemini_helpers import gemini_text
 
 # ── Rules (identical to original) ────────────────────────────────
@@ -26,15 +28,18 @@ FALLBACK_MSG = (
 )
 
 
+# GPT_MASTER_RULES is sent separately as the system instruction
+_PROMPT_PREFIX = "User request: "
+_PROMPT_SUFFIX = "\n\nProvide a step-by-step, concise answer. If unsure, say so."
+
+
+@lru_cache(maxsize=1024)
 def _build_prompt(user_query: str) -> str:
-    return (
-        GPT_MASTER_RULES
-        + "\n\nUser request: "
-        + user_query.strip()
-        + "\n\nProvide a step-by-step, concise answer. If unsure, say so."
-    )
+    return f"{_PROMPT_PREFIX}{user_query.strip()}{_PROMPT_SUFFIX}"
 
 
-def gpt_master_answer(user_query: str) -> str:
-    out = gemini_text(_build_prompt(user_query))
+async def gpt_master_answer(user_query: str) -> str:
+    out = await gemini_text(
+        _build_prompt(user_query), system_instruction=GPT_MASTER_RULES
+    )
     return out if out else FALLBACK_MSG
@@ -4,18 +4,22 @@ Pydantic models for request / response payloads.
 Only the auto-routed chat flow remains.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ─── Request ────────────────────────────────────────────────────
 
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True, frozen=True)
+
     query: str = Field(..., min_length=1, description="User query text")
 
 
 # ─── Response ───────────────────────────────────────────────────
 
 class RoutedResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     bot: str = Field(..., description="Bot that handled the query")
     reply: str = Field(..., description="Bot response text")
     routed_to: str = Field(..., description="Bot label the query was routed to")
@@ -0,0 +1,100 @@
+import asyncio
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+import gemini_helpers  # noqa: E402
+
+
+def _key(tag: bytes) -> gemini_helpers.CacheKey:
+    return "text", False, tag
+
+
+def test_cancelled_sole_waiter_cancels_call():
+    calls = []
+
+    async def make_call():
+        calls.append("start")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            calls.append("cancelled")
+            raise
+        return "reply"
+
+    async def run():
+        key = _key(b"sole")
+        caller = asyncio.create_task(gemini_helpers._single_flight(key, make_call))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.01)
+        assert calls == ["start", "cancelled"]
+        assert key not in gemini_helpers._INFLIGHT
+        assert gemini_helpers._CACHE.get(key) is None
+
+    asyncio.run(run())
+
+
+def test_call_after_cancel_starts_fresh():
+    async def make_call():
+        await asyncio.sleep(0.05)
+        return "reply"
+
+    async def run():
+        key = _key(b"fresh")
+        a = asyncio.create_task(gemini_helpers._single_flight(key, make_call))
+        await asyncio.sleep(0.01)
+        a.cancel()
+        # Same key, before the cancelled call's done-callback has run
+        b = asyncio.create_task(gemini_helpers._single_flight(key, make_call))
+        assert await b == "reply"
+        assert gemini_helpers._CACHE.get(key) == "reply"
+        assert key not in gemini_helpers._INFLIGHT
+
+    asyncio.run(run())
+
+
+def test_remaining_waiter_keeps_call_alive():
+    async def make_call():
+        await asyncio.sleep(0.05)
+        return "reply"
+
+    async def run():
+        key = _key(b"shared")
+        a = asyncio.create_task(gemini_helpers._single_flight(key, make_call))
+        b = asyncio.create_task(gemini_helpers._single_flight(key, make_call))
+        await asyncio.sleep(0.01)
+        a.cancel()
+        assert await b == "reply"
+
+    asyncio.run(run())
+
+
+class _FakeModels:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return type("Resp", (), {"text": f"{model}: {contents}"})()
+
+
+def test_queued_calls_do_not_hedge(monkeypatch):
+    models = _FakeModels(delay=0.2)
+    client = type("Client", (), {"aio": type("Aio", (), {"models": models})()})()
+    monkeypatch.setattr(gemini_helpers, "_get_client", lambda: client)
+    monkeypatch.setattr(gemini_helpers, "GEMINI_HEDGE_DELAY", 0.3)
+
+    async def run():
+        monkeypatch.setattr(gemini_helpers, "_GEMINI_SEM", asyncio.Semaphore(2))
+        prompts = [f"prompt {i}" for i in range(4)]
+        replies = await asyncio.gather(
+            *(gemini_helpers._generate(p, ["primary", "backup"]) for p in prompts)
+        )
+        assert all(r.startswith("primary") for r in replies)
+
+    asyncio.run(run())
+    # Each prompt reached Gemini once; none hedged while waiting for a slot
+    assert models.calls == 4